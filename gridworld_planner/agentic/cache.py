@@ -0,0 +1,201 @@
+"""
+Result cache for repeated planning requests.
+Keys are a canonical hash of the grid, start/goal and planner/eval config,
+with LRU + TTL eviction, a memory cap and an optional SQLite backend.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from agentic.eval.runner import run_task_from_dict
+
+# Planner/eval defaults applied by the runner, so omitted and explicit defaults hash the same
+PLANNER_DEFAULTS = {
+    "heuristic": "manhattan",
+    "weight": 1.0,
+    "max_expansions": 200000,
+    "timeout_ms": None,
+    "max_nodes": None,
+    "frontier": "heap",
+}
+EVAL_DEFAULTS = {
+    "compute_oracle_optimal": False,
+    "measure_memory": False,
+}
+
+
+def canonical_task(task_json):
+    # Reduce a TaskSpec to the fields that determine its result, in a fixed form.
+    # task_id is excluded since it only labels the request.
+    grid = task_json["grid"]
+    obstacles = grid.get("obstacles")
+    if obstacles is not None:
+        obstacles = sorted([int(x), int(y)] for x, y in obstacles)
+    planner = dict(PLANNER_DEFAULTS, **task_json["planner"])
+    planner["weight"] = float(planner["weight"])
+    return {
+        "seed": task_json.get("seed", 0),
+        "grid": {
+            "width": grid["width"],
+            "height": grid["height"],
+            "obstacle_density": float(grid.get("obstacle_density", 0.0)),
+            "obstacles": obstacles,
+            "start": [int(v) for v in grid["start"]],
+            "goal": [int(v) for v in grid["goal"]],
+            "allow_diagonal": grid.get("allow_diagonal", False),
+        },
+        "planner": planner,
+        "eval": dict(EVAL_DEFAULTS, **task_json.get("eval", {})),
+    }
+
+
+def task_cache_key(task_json):
+    # Return (key, canonical_json) for a TaskSpec
+    canonical = json.dumps(canonical_task(task_json), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest(), canonical
+
+
+class ResultCache:
+    def __init__(self, max_entries=1024, ttl_s=3600.0, max_bytes=64 * 1024 * 1024, sqlite_path=None):
+        # In-memory LRU of key -> (canonical, result, created, size), optionally backed by SQLite
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = None
+        if sqlite_path is not None:
+            self.db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, canonical TEXT NOT NULL, result TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self.db.commit()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _expired(self, created):
+        return self.ttl_s is not None and time.time() - created > self.ttl_s
+
+    def _evict(self):
+        # Drop least recently used entries until within the entry and memory caps
+        while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, (_, _, _, size) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+
+    def _store(self, key, canonical, result, created):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[3]
+        size = len(canonical) + len(json.dumps(result))
+        self.entries[key] = (canonical, result, created, size)
+        self.total_bytes += size
+        self._evict()
+
+    def _prune_db(self, now):
+        # Apply the TTL and the entry/byte caps to the SQLite backend too,
+        # dropping expired rows and then the oldest rows beyond the caps
+        if self.ttl_s is not None:
+            self.db.execute("DELETE FROM results WHERE created < ?", (now - self.ttl_s,))
+        self.db.execute(
+            "DELETE FROM results WHERE key NOT IN "
+            "(SELECT key FROM results ORDER BY created DESC, key LIMIT ?)",
+            (self.max_entries,),
+        )
+        self.db.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM ("
+            "SELECT key, SUM(LENGTH(canonical) + LENGTH(result)) OVER (ORDER BY created DESC, key) AS running "
+            "FROM results) WHERE running > ?)",
+            (self.max_bytes,),
+        )
+
+    def get(self, task_json):
+        # Return a cached result marked with cached=True, or None on a miss
+        key, canonical = task_cache_key(task_json)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and (entry[0] != canonical or self._expired(entry[2])):
+                # Never serve a result stored for a different config (or a stale one)
+                self.total_bytes -= self.entries.pop(key)[3]
+                entry = None
+            if entry is None and self.db is not None:
+                row = self.db.execute(
+                    "SELECT canonical, result, created FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[0] == canonical and not self._expired(row[2]):
+                    entry = (canonical, json.loads(row[1]), row[2])
+                    self._store(key, *entry)
+            if entry is None:
+                self.misses += 1
+                return None
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            self.hits += 1
+        result = dict(entry[1])
+        result["task_id"] = task_json.get("task_id", "")
+        result["cached"] = True
+        return result
+
+    def put(self, task_json, result):
+        # Store a freshly computed result for this TaskSpec
+        key, canonical = task_cache_key(task_json)
+        created = time.time()
+        result = dict(result)
+        result.pop("cached", None)
+        with self.lock:
+            self._store(key, canonical, result, created)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO results (key, canonical, result, created) VALUES (?, ?, ?, ?)",
+                    (key, canonical, json.dumps(result), created),
+                )
+                self._prune_db(created)
+                self.db.commit()
+
+    def clear(self):
+        # Remove all entries from memory and the SQLite backend
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            if self.db is not None:
+                self.db.execute("DELETE FROM results")
+                self.db.commit()
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+# Algorithms whose results are not reproducible (MCTS uses unseeded global random)
+NONDETERMINISTIC_ALGORITHMS = {"mcts"}
+
+
+def is_cacheable(task_json):
+    # Tasks that record a trace must run for real so their own trace is written
+    return (task_json["planner"]["algorithm"] not in NONDETERMINISTIC_ALGORITHMS
+            and not task_json.get("eval", {}).get("record_trace"))
+
+
+def run_task_cached(task_json, cache):
+    # Serve from the cache when possible, otherwise solve and store the result.
+    # Non-reproducible tasks bypass the cache, and timeouts (which depend on the
+    # clock and machine load) are returned but never stored.
+    if not is_cacheable(task_json):
+        result = run_task_from_dict(task_json)
+        result["cached"] = False
+        return result
+    result = cache.get(task_json)
+    if result is not None:
+        return result
+    result = run_task_from_dict(task_json)
+    if result["termination_reason"] != "timeout":
+        cache.put(task_json, result)
+    result["cached"] = False
+    return result
@@ -0,0 +1,91 @@
+"""
+Batched engine for many small planning tasks.
+Same-sized grids are stacked into one NumPy tensor and solved together
+with a vectorized wavefront instead of one Python search per task.
+"""
+import time
+import numpy as np
+from agentic.env.generators import generate_obstacles
+from agentic.search.wavefront import batched_wavefront, batched_paths
+
+
+def stack_tasks(tasks):
+    # Build the (N, height, width) free-cell tensor plus (N, 2) start/goal arrays
+    height = tasks[0]["grid"]["height"]
+    width = tasks[0]["grid"]["width"]
+    free = np.ones((len(tasks), height, width), dtype=bool)
+    starts = np.empty((len(tasks), 2), dtype=np.int64)
+    goals = np.empty((len(tasks), 2), dtype=np.int64)
+    for i, task in enumerate(tasks):
+        grid = task["grid"]
+        start = tuple(grid["start"])
+        goal = tuple(grid["goal"])
+        obstacles = grid.get("obstacles")
+        # Generate obstacles if not provided
+        if obstacles is None:
+            obstacles = generate_obstacles(width, height, grid.get("obstacle_density", 0.0), task.get("seed", 0), start, goal)
+        if len(obstacles):
+            cells = np.asarray(obstacles, dtype=np.int64).reshape(-1, 2)
+            free[i, cells[:, 1], cells[:, 0]] = False
+        starts[i] = start
+        goals[i] = goal
+    return free, starts, goals
+
+
+def run_tasks_batched(tasks, batch_size=256):
+    # Solve every task with the batched wavefront and return (results, paths):
+    # RunResult records and paths (None if unreachable), both in input order.
+    # Tasks are grouped by grid size and solved batch_size at a time;
+    # runtime_ms is each task's share of its batch time.
+    results = [None] * len(tasks)
+    all_paths = [None] * len(tasks)
+    by_size = {}
+    for i, task in enumerate(tasks):
+        by_size.setdefault((task["grid"]["width"], task["grid"]["height"]), []).append(i)
+    for indices in by_size.values():
+        for lo in range(0, len(indices), batch_size):
+            chunk = indices[lo:lo + batch_size]
+            chunk_tasks = [tasks[i] for i in chunk]
+            t0 = time.time()
+            free, starts, goals = stack_tasks(chunk_tasks)
+            dist, max_frontier = batched_wavefront(free, goals, starts)
+            costs, paths = batched_paths(dist, starts)
+            reached = (dist >= 0).sum(axis=(1, 2))
+            runtime_ms = int((time.time() - t0) * 1000 / len(chunk))
+            for k, i in enumerate(chunk):
+                results[i] = _make_result(tasks[i], paths[k], int(reached[k]), int(max_frontier[k]), runtime_ms)
+                all_paths[i] = paths[k]
+    return results, all_paths
+
+
+def _make_result(task_json, path, nodes_expanded, max_frontier_size, runtime_ms):
+    # Build a RunResult record matching the one produced by run_task_from_dict
+    grid = task_json["grid"]
+    eval_cfg = task_json.get("eval", {})
+    success = path is not None
+    path_cost = len(path) - 1 if success else None
+    # The wavefront is exact, so it is its own oracle
+    optimal_cost = path_cost if eval_cfg.get("compute_oracle_optimal") else None
+    reason = "goal_reached" if success else "no_path"
+    return {
+        "task_id": task_json.get("task_id", ""),
+        "status": "success" if success else reason,
+        "algorithm": "wavefront",
+        "heuristic": "none",
+        "weight": 1.0,
+        "grid_width": grid["width"],
+        "grid_height": grid["height"],
+        "obstacle_density": grid.get("obstacle_density", 0.0),
+        "seed": task_json.get("seed", 0),
+        "success": success,
+        "path_len": path_cost,
+        "path_cost": path_cost,
+        "optimal_cost": optimal_cost,
+        "optimality_gap": 1.0 if optimal_cost else None,
+        "nodes_expanded": nodes_expanded,
+        "max_frontier_size": max_frontier_size,
+        "peak_memory_kb": None,
+        "runtime_ms": runtime_ms,
+        "termination_reason": reason,
+        "timestamp_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
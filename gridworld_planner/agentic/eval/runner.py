@@ -1,22 +1,25 @@
 """
 Runner for executing planning tasks from a task dictionary.
 """
+import os
+import re
 import time
+import tracemalloc
+import uuid
 from agentic.env.gridworld import Gridworld
 from agentic.env.generators import generate_obstacles
 from agentic.search.astar import astar_search
 from agentic.search.bfs import bfs_search
 from agentic.search.mcts import mcts_search
+from agentic.search.ida import ida_star_search
+from agentic.search.fringe import fringe_search
 from agentic.search.heuristics import manhattan, weighted_manhattan
+from agentic.search.trace import SearchTrace
 from agentic.eval.metrics import optimality_gap
 
-def run_task_from_dict(task_json):
-    # Unpack task configuration
+def build_env_from_dict(task_json):
+    # Build the Gridworld described by the task's grid section
     grid = task_json["grid"]
-    planner = task_json["planner"]
-    eval_cfg = task_json.get("eval", {})
-
-    # Extract grid and planner parameters
     width = grid["width"]
     height = grid["height"]
     start = tuple(grid["start"])
@@ -29,45 +32,116 @@ def run_task_from_dict(task_json):
         obstacles = generate_obstacles(width, height, density, seed, start, goal)
     else:
         obstacles = [tuple(x) for x in obstacles]
+    return Gridworld(width, height, obstacles, start, goal)
+
+
+def oracle_optimal_cost(env, max_expansions=200000):
+    # Compute the optimal path cost using BFS (oracle), or None if unreachable
+    opt_path, _, _, _ = bfs_search(env, max_expansions)
+    if opt_path:
+        return len(opt_path) - 1
+    return None
+
+
+def run_task_from_dict(task_json, trace=None):
+    # Build the environment and run the configured planner on it
+    env = build_env_from_dict(task_json)
+    return run_task_on_env(env, task_json, trace=trace)
+
+
+def run_task_on_env(env, task_json, optimal_cost=None, oracle_done=False, trace=None):
+    # Run the task's planner on an already-built environment.
+    # If oracle_done is set, optimal_cost (None if the oracle found no path) is used
+    # instead of re-running the oracle, so tasks sharing one map only pay for it once.
+    grid = task_json["grid"]
+    planner = task_json["planner"]
+    eval_cfg = task_json.get("eval", {})
 
-    # Create the Gridworld environment
-    env = Gridworld(width, height, obstacles, start, goal)
+    # Extract grid and planner parameters
+    width = grid["width"]
+    height = grid["height"]
+    seed = task_json.get("seed", 0)
+    density = grid.get("obstacle_density", 0.0)
     algorithm = planner["algorithm"]
     heuristic_name = planner.get("heuristic", "manhattan")
     weight = planner.get("weight", 1.0)
     max_expansions = planner.get("max_expansions", 200000)
     timeout_ms = planner.get("timeout_ms")
+    max_nodes = planner.get("max_nodes")
+    frontier = planner.get("frontier", "heap")
+    # Peak memory is traced only on request, since tracemalloc slows the search down
+    measure_memory = eval_cfg.get("measure_memory", False)
+    # Expansion traces go to a preallocated ring buffer (MCTS is not traced).
+    # Callers may pass their own SearchTrace to keep it; otherwise eval.record_trace
+    # creates one, which must be saved to eval.trace_dir or it would be lost.
+    trace_dir = eval_cfg.get("trace_dir")
+    if algorithm == "mcts":
+        trace = None
+    elif trace is None and eval_cfg.get("record_trace"):
+        if not trace_dir:
+            raise ValueError("eval.record_trace needs eval.trace_dir or a trace argument")
+        capacity = eval_cfg.get("trace_capacity", min(max_expansions, 4 * width * height, 1 << 20))
+        trace = SearchTrace(capacity)
+    # Only start (and later stop) tracing if the caller is not already tracing,
+    # and reset the peak so it reflects this search alone. reset_peak needs
+    # Python 3.9+; without it a peak is only reported when tracing starts fresh here.
+    started_tracing = False
+    peak_is_fresh = False
+    if measure_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+            peak_is_fresh = True
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+            peak_is_fresh = True
 
-    # Select and run the appropriate planning algorithm
-    if algorithm == "astar":
-        heuristic_fn = manhattan if heuristic_name == "manhattan" else weighted_manhattan
-        t0 = time.time()
-        path, nodes_expanded, max_frontier_size, reason = astar_search(env, heuristic_fn, weight, max_expansions, timeout_ms)
-        runtime_ms = int((time.time() - t0) * 1000)
-    elif algorithm == "bfs":
-        t0 = time.time()
-        path, nodes_expanded, max_frontier_size, reason = bfs_search(env, max_expansions)
-        runtime_ms = int((time.time() - t0) * 1000)
-    elif algorithm == "mcts":
-        t0 = time.time()
-        path, nodes_expanded, max_frontier_size, reason = mcts_search(env, max_iterations=1000, rollout_depth=40, timeout_ms=timeout_ms or 2000)
-        runtime_ms = int((time.time() - t0) * 1000)
-    else:
-        raise ValueError(f"Unknown algorithm: {algorithm}")
+    try:
+        # Select and run the appropriate planning algorithm
+        if algorithm == "astar":
+            heuristic_fn = manhattan if heuristic_name == "manhattan" else weighted_manhattan
+            t0 = time.time()
+            path, nodes_expanded, max_frontier_size, reason = astar_search(env, heuristic_fn, weight, max_expansions, timeout_ms, frontier, trace)
+            runtime_ms = int((time.time() - t0) * 1000)
+        elif algorithm == "bfs":
+            t0 = time.time()
+            path, nodes_expanded, max_frontier_size, reason = bfs_search(env, max_expansions, trace)
+            runtime_ms = int((time.time() - t0) * 1000)
+        elif algorithm == "mcts":
+            t0 = time.time()
+            path, nodes_expanded, max_frontier_size, reason = mcts_search(env, max_iterations=1000, rollout_depth=40, timeout_ms=timeout_ms or 2000)
+            runtime_ms = int((time.time() - t0) * 1000)
+        elif algorithm in ("ida_star", "fringe"):
+            # Memory-bounded planners, optionally capped by planner.max_nodes.
+            # IDA* can only prove an unreachable goal on small open regions; otherwise
+            # it ends with 'budget_exceeded' where BFS would report 'no_path'.
+            heuristic_fn = manhattan if heuristic_name == "manhattan" else weighted_manhattan
+            search_fn = ida_star_search if algorithm == "ida_star" else fringe_search
+            t0 = time.time()
+            path, nodes_expanded, max_frontier_size, reason = search_fn(env, heuristic_fn, weight, max_expansions, timeout_ms, max_nodes, trace)
+            runtime_ms = int((time.time() - t0) * 1000)
+        else:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        peak_memory_kb = None
+        if measure_memory and peak_is_fresh:
+            peak_memory_kb = tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
 
     # Collect results and compute metrics
     success = path is not None
     path_len = len(path) - 1 if path else None
     path_cost = path_len if path else None
-    optimal_cost = None
     optimal_gap = None
     #  compute the optimal cost using BFS (oracle)
     if eval_cfg.get("compute_oracle_optimal") and algorithm != "bfs":
-        opt_path, _, _, _ = bfs_search(env, max_expansions)
-        if opt_path:
-            optimal_cost = len(opt_path) - 1
-            if path_cost is not None:
-                optimal_gap = optimality_gap(path_cost, optimal_cost)
+        if not oracle_done:
+            optimal_cost = oracle_optimal_cost(env, max_expansions)
+        if optimal_cost is not None and path_cost is not None:
+            optimal_gap = optimality_gap(path_cost, optimal_cost)
+    else:
+        optimal_cost = None
 
     result = {
         "task_id": task_json.get("task_id", ""),
@@ -86,8 +160,20 @@ def run_task_from_dict(task_json):
         "optimality_gap": optimal_gap,
         "nodes_expanded": nodes_expanded,
         "max_frontier_size": max_frontier_size,
+        "peak_memory_kb": peak_memory_kb,
         "runtime_ms": runtime_ms,
         "termination_reason": reason,
         "timestamp_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
     }
+    if trace is not None:
+        # Save the binary trace when a trace directory is configured;
+        # tasks without an id get a unique file name
+        result["trace_expansions"] = trace.count
+        result["trace_path"] = None
+        if trace_dir:
+            os.makedirs(trace_dir, exist_ok=True)
+            # Keep only file-name-safe characters so ids like "sweep:gw_000000" stay in trace_dir
+            name = re.sub(r"[^A-Za-z0-9._-]", "_", result["task_id"]) or f"task_{uuid.uuid4().hex}"
+            result["trace_path"] = os.path.join(trace_dir, f"{name}.gwtrace")
+            trace.save(result["trace_path"])
     return result
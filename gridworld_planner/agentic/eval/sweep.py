@@ -0,0 +1,140 @@
+"""
+Declarative sweep specifications for batch evaluation.
+
+A sweep spec (JSON or YAML) lists grid sizes, densities, seeds and planner
+configs. It expands to tasks grouped by map, so each map is generated once
+and every planner (and the oracle) runs against the same Gridworld.
+"""
+import copy
+import json
+import os
+from agentic.env.generators import generate_obstacles
+from agentic.env.gridworld import Gridworld
+from agentic.eval.runner import run_task_on_env, oracle_optimal_cost
+
+try:
+    import yaml
+except ImportError:  # YAML specs are optional; JSON always works
+    yaml = None
+
+
+# Default sweep, matching the original hardcoded ablation in run_batch
+DEFAULT_SWEEP = {
+    "name": "exp_2025-12-29_01",
+    "grid_sizes": [10, 20, 30, 40, 50],
+    "densities": [0.1, 0.2, 0.3, 0.4, 0.5],
+    "seeds": [42, 43, 44],
+    "planners": [
+        {"algorithm": "bfs", "heuristic": "manhattan", "weight": 1.0},
+        # weighted = A weighted version of the Manhattan heuristic
+        # makes A* more aggressive, reducing search time at the cost of solution optimality
+        {"algorithm": "astar", "heuristic": "manhattan", "weight": 1.0},
+        {"algorithm": "astar", "heuristic": "weighted", "weight": 1.5},
+        {"algorithm": "astar", "heuristic": "weighted", "weight": 2.0},
+        # MCTS does not use heuristics or weights, so pass defaults
+        {"algorithm": "mcts", "heuristic": "none", "weight": 1.0},
+    ],
+    "max_expansions": 200000,
+    "timeout_ms": 2000,
+    "tie_break": "lower_h",
+    "eval": {
+        "compute_oracle_optimal": True,
+        "oracle_algorithm": "bfs",
+        "record_trace": False,
+    },
+}
+
+
+def load_sweep_spec(path):
+    # Load a sweep spec from a .json, .yaml or .yml file
+    with open(path, "r", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            if yaml is None:
+                raise ImportError("PyYAML is required to load YAML sweep specs")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def expand_sweep(spec):
+    # Expand a sweep spec into map groups: one group per (width, height, density, seed),
+    # each holding the TaskSpecs of every planner to run on that map.
+    # Task ids are assigned in spec order, so they are stable across schedules.
+    groups = []
+    task_id = 0
+    eval_cfg = spec.get("eval", DEFAULT_SWEEP["eval"])
+    for size in spec["grid_sizes"]:
+        # A size is either a square side or an explicit [width, height] pair
+        width, height = (size, size) if isinstance(size, int) else tuple(size)
+        for density in spec["densities"]:
+            for seed in spec["seeds"]:
+                tasks = []
+                for planner in spec["planners"]:
+                    tasks.append({
+                        "task_id": f"gw_{task_id:06d}",
+                        "seed": seed,
+                        "grid": {
+                            "width": width,
+                            "height": height,
+                            "obstacle_density": density,
+                            "obstacles": None,
+                            "start": [0, 0],
+                            "goal": [width - 1, height - 1],
+                            "allow_diagonal": False
+                        },
+                        # Fill in sweep-level defaults but keep every other planner key
+                        # (e.g. frontier, max_nodes) as given
+                        "planner": dict({
+                            "heuristic": "manhattan",
+                            "weight": 1.0,
+                            "max_expansions": spec.get("max_expansions", 200000),
+                            "timeout_ms": spec.get("timeout_ms", 2000),
+                            "tie_break": spec.get("tie_break", "lower_h")
+                        }, **planner),
+                        "eval": copy.deepcopy(eval_cfg)
+                    })
+                    task_id += 1
+                groups.append({
+                    "width": width,
+                    "height": height,
+                    "density": density,
+                    "seed": seed,
+                    "tasks": tasks,
+                })
+    return groups
+
+
+def schedule_groups(groups):
+    # Order map groups largest-first (cells x planners) to reduce tail time
+    return sorted(groups, key=lambda g: g["width"] * g["height"] * len(g["tasks"]), reverse=True)
+
+
+def run_group(group):
+    # Generate and build the group's map once, run the oracle once,
+    # then run every planner in the group against the shared instance
+    width, height = group["width"], group["height"]
+    start = (0, 0)
+    goal = (width - 1, height - 1)
+    obstacles = generate_obstacles(width, height, group["density"], group["seed"], start, goal)
+    env = Gridworld(width, height, obstacles, start, goal)
+    optimal_cost = None
+    oracle_done = False
+    if any(t["eval"].get("compute_oracle_optimal") and t["planner"]["algorithm"] != "bfs" for t in group["tasks"]):
+        max_expansions = max(t["planner"]["max_expansions"] for t in group["tasks"])
+        optimal_cost = oracle_optimal_cost(env, max_expansions)
+        oracle_done = True
+    results = []
+    for task in group["tasks"]:
+        task["grid"]["obstacles"] = obstacles
+        results.append(run_task_on_env(env, task, optimal_cost, oracle_done))
+    return results
+
+
+def run_sweep(spec, logger=None):
+    # Run every task in the sweep, map group by map group, largest first
+    results = []
+    for group in schedule_groups(expand_sweep(spec)):
+        for result in run_group(group):
+            if logger is not None:
+                logger.log_run(result)
+            results.append(result)
+    return results
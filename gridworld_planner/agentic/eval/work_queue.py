@@ -0,0 +1,293 @@
+"""
+SQLite work queue for running sweeps across many worker processes or hosts.
+
+A sweep is enqueued as map groups (see agentic.eval.sweep). Workers claim
+groups under time-limited leases (renewed by a heartbeat while running),
+write results idempotently by task_id, and expired leases (e.g. from a
+crashed worker) are reclaimed by others. Items and task ids are prefixed
+with a sweep id, so several sweeps can share one queue file.
+Multi-host use needs the queue file on a filesystem with working locks.
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from agentic.eval.sweep import DEFAULT_SWEEP, expand_sweep, load_sweep_spec, run_group
+from agentic.logging_utils import JsonlLogger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    priority INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    num_tasks INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    task_id TEXT PRIMARY KEY,
+    item_id TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    finished REAL NOT NULL,
+    result TEXT NOT NULL
+);
+"""
+
+
+def sweep_id(spec):
+    # Identity of a sweep: its name (if any) plus a hash of the canonical spec,
+    # so different sweeps never collide even when they share a name
+    digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return f"{spec['name']}-{digest}" if spec.get("name") else digest
+
+
+def group_item_id(group, sweep=None):
+    # Stable queue id for a map group, scoped to its sweep
+    item_id = f"w{group['width']}x{group['height']}_d{group['density']}_s{group['seed']}"
+    return f"{sweep}:{item_id}" if sweep else item_id
+
+
+class WorkQueue:
+    def __init__(self, path, timeout_s=30.0, max_attempts=3):
+        # Autocommit connection; writes use explicit BEGIN IMMEDIATE transactions.
+        # Items that fail (or lose their lease) max_attempts times are marked 'failed'.
+        self.path = path
+        self.max_attempts = max_attempts
+        self.db = sqlite3.connect(path, timeout=timeout_s, isolation_level=None)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def enqueue_sweep(self, spec):
+        # Add every map group of the sweep; re-enqueueing the same sweep is a no-op.
+        # Priority is cells x planners, so workers claim the largest groups first.
+        sweep = sweep_id(spec)
+        rows = []
+        for group in expand_sweep(spec):
+            for task in group["tasks"]:
+                task["task_id"] = f"{sweep}:{task['task_id']}"
+            priority = group["width"] * group["height"] * len(group["tasks"])
+            rows.append((group_item_id(group, sweep), priority, json.dumps(group), len(group["tasks"])))
+        self.db.execute("BEGIN IMMEDIATE")
+        before = self.db.total_changes
+        self.db.executemany(
+            "INSERT OR IGNORE INTO items (item_id, priority, payload, num_tasks) VALUES (?, ?, ?, ?)", rows
+        )
+        added = self.db.total_changes - before
+        self.db.execute("COMMIT")
+        return added
+
+    def claim(self, worker_id, lease_s=60.0):
+        # Lease the highest-priority pending or expired item; returns (item_id, group) or None
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        # Expired leases that already used up their attempts (e.g. a group that keeps
+        # crashing its worker) are given up on rather than re-leased forever
+        self.db.execute(
+            "UPDATE items SET status = 'failed', lease_owner = NULL, lease_expires = NULL, "
+            "last_error = COALESCE(last_error, 'lease expired') "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, self.max_attempts),
+        )
+        row = self.db.execute(
+            "SELECT item_id, payload FROM items "
+            "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+            "ORDER BY priority DESC, item_id LIMIT 1",
+            (now,),
+        ).fetchone()
+        if row is None:
+            self.db.execute("COMMIT")
+            return None
+        self.db.execute(
+            "UPDATE items SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+            "WHERE item_id = ?",
+            (worker_id, now + lease_s, row[0]),
+        )
+        self.db.execute("COMMIT")
+        return row[0], json.loads(row[1])
+
+    def renew(self, item_id, worker_id, lease_s=60.0):
+        # Extend a lease still held by this worker; returns False if it was lost
+        cur = self.db.execute(
+            "UPDATE items SET lease_expires = ? WHERE item_id = ? AND status = 'leased' AND lease_owner = ?",
+            (time.time() + lease_s, item_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, item_id, worker_id, error):
+        # Record a failed attempt: release the item for retry, or mark it 'failed'
+        # once it has used max_attempts
+        self.db.execute(
+            "UPDATE items SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_owner = NULL, lease_expires = NULL, last_error = ? "
+            "WHERE item_id = ? AND status = 'leased' AND lease_owner = ?",
+            (self.max_attempts, error, item_id, worker_id),
+        )
+
+    def failures(self):
+        # (item_id, attempts, last_error) for every failed item
+        return self.db.execute(
+            "SELECT item_id, attempts, last_error FROM items WHERE status = 'failed' ORDER BY item_id"
+        ).fetchall()
+
+    def complete(self, item_id, worker_id, results):
+        # Store results (first write per task_id wins) and mark the item done
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        self.db.executemany(
+            "INSERT OR IGNORE INTO results (task_id, item_id, worker, finished, result) VALUES (?, ?, ?, ?, ?)",
+            [(r["task_id"], item_id, worker_id, now, json.dumps(r)) for r in results],
+        )
+        self.db.execute(
+            "UPDATE items SET status = 'done', lease_owner = ?, lease_expires = NULL WHERE item_id = ?",
+            (worker_id, item_id),
+        )
+        self.db.execute("COMMIT")
+
+    def results(self):
+        # All stored results, ordered by task_id
+        return [json.loads(r[0]) for r in self.db.execute("SELECT result FROM results ORDER BY task_id")]
+
+    def progress(self):
+        # Item counts by state, task counts and throughput so far
+        now = time.time()
+        counts = dict(self.db.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall())
+        expired = self.db.execute(
+            "SELECT COUNT(*) FROM items WHERE status = 'leased' AND lease_expires < ?", (now,)
+        ).fetchone()[0]
+        total_tasks = self.db.execute("SELECT COALESCE(SUM(num_tasks), 0) FROM items").fetchone()[0]
+        tasks_done, first, last = self.db.execute(
+            "SELECT COUNT(*), MIN(finished), MAX(finished) FROM results"
+        ).fetchone()
+        per_worker = dict(self.db.execute("SELECT worker, COUNT(*) FROM results GROUP BY worker").fetchall())
+        elapsed_s = (last - first) if tasks_done else 0.0
+        return {
+            "items_total": sum(counts.values()),
+            "items_pending": counts.get("pending", 0),
+            "items_leased": counts.get("leased", 0) - expired,
+            "items_expired": expired,
+            "items_done": counts.get("done", 0),
+            "items_failed": counts.get("failed", 0),
+            "tasks_total": total_tasks,
+            "tasks_done": tasks_done,
+            "elapsed_s": elapsed_s,
+            "tasks_per_s": tasks_done / elapsed_s if elapsed_s > 0 else None,
+            "tasks_by_worker": per_worker,
+        }
+
+
+def default_worker_id():
+    # host:pid identifies a worker across machines sharing the queue
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _heartbeat(queue_path, item_id, worker_id, lease_s, stop):
+    # Renew the lease every third of lease_s until stopped or the lease is lost.
+    # Uses its own connection, since SQLite connections are per thread.
+    queue = WorkQueue(queue_path)
+    try:
+        while not stop.wait(lease_s / 3):
+            if not queue.renew(item_id, worker_id, lease_s):
+                break
+    finally:
+        queue.close()
+
+
+def run_worker(queue_path, worker_id=None, lease_s=60.0, poll_s=1.0, max_items=None, max_attempts=3):
+    # Claim and run map groups until the queue is drained. While other workers
+    # still hold live leases, keep polling so their items can be reclaimed if they expire.
+    # A heartbeat thread keeps the lease alive while a group runs, and a group that
+    # raises is released for retry (or marked failed) instead of killing the worker.
+    worker_id = worker_id or default_worker_id()
+    queue = WorkQueue(queue_path, max_attempts=max_attempts)
+    done = 0
+    try:
+        while max_items is None or done < max_items:
+            claimed = queue.claim(worker_id, lease_s)
+            if claimed is None:
+                status = queue.progress()
+                if status["items_pending"] == 0 and status["items_leased"] == 0 and status["items_expired"] == 0:
+                    break
+                time.sleep(poll_s)
+                continue
+            item_id, group = claimed
+            stop = threading.Event()
+            heartbeat = threading.Thread(
+                target=_heartbeat, args=(queue_path, item_id, worker_id, lease_s, stop), daemon=True
+            )
+            heartbeat.start()
+            try:
+                results = run_group(group)
+            except Exception as exc:
+                queue.fail(item_id, worker_id, f"{type(exc).__name__}: {exc}")
+                continue
+            finally:
+                stop.set()
+                heartbeat.join()
+            queue.complete(item_id, worker_id, results)
+            done += 1
+    finally:
+        queue.close()
+    return done
+
+
+def format_progress(status):
+    # One-line progress/throughput report
+    rate = status["tasks_per_s"]
+    return (
+        f"items {status['items_done']}/{status['items_total']} done, {status['items_failed']} failed, "
+        f"{status['items_leased']} leased, {status['items_expired']} expired, {status['items_pending']} pending; "
+        f"tasks {status['tasks_done']}/{status['tasks_total']}"
+        + (f" at {rate:.1f}/s" if rate else "")
+    )
+
+
+def main(argv=None):
+    # CLI: enqueue a sweep, run a worker, report progress, or export results
+    parser = argparse.ArgumentParser(description="SQLite work queue for Gridworld sweeps")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("enqueue")
+    p.add_argument("queue")
+    p.add_argument("spec", nargs="?")
+    p = sub.add_parser("work")
+    p.add_argument("queue")
+    p.add_argument("--worker-id")
+    p.add_argument("--lease-s", type=float, default=60.0)
+    p.add_argument("--max-items", type=int)
+    p = sub.add_parser("progress")
+    p.add_argument("queue")
+    p = sub.add_parser("export")
+    p.add_argument("queue")
+    p.add_argument("out_dir")
+    args = parser.parse_args(argv)
+
+    if args.command == "work":
+        n = run_worker(args.queue, args.worker_id, args.lease_s, max_items=args.max_items)
+        print(f"Worker finished {n} items")
+        return
+    queue = WorkQueue(args.queue)
+    try:
+        if args.command == "enqueue":
+            spec = load_sweep_spec(args.spec) if args.spec else DEFAULT_SWEEP
+            print(f"Enqueued {queue.enqueue_sweep(spec)} new items")
+        elif args.command == "progress":
+            print(format_progress(queue.progress()))
+        elif args.command == "export":
+            logger = JsonlLogger(args.out_dir)
+            for result in queue.results():
+                logger.log_run(result)
+            print(f"Results written to: {args.out_dir}")
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
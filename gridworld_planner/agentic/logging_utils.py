@@ -3,7 +3,8 @@ Minimal JSONL logger for planning runs and traces.
 """
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Union
+from agentic.search.trace import SearchTrace
 
 class JsonlLogger:
     def __init__(self, out_dir: str):
@@ -11,16 +12,21 @@ class JsonlLogger:
         self.out_dir = out_dir
         os.makedirs(out_dir, exist_ok=True)
         self.runs_path = os.path.join(out_dir, "runs.jsonl")
+        self.traces_dir = os.path.join(out_dir, "traces")
 
     def log_run(self, result: Dict[str, Any]) -> None:
         # Append a single run result to the runs.jsonl file
         with open(self.runs_path, "a", encoding="utf-8") as f:
             f.write(json.dumps(result) + "\n")
 
-    def log_trace(self, task_id: str, trace: Dict[str, Any]) -> None:
-        # Save a trace for a specific task as a separate JSON file
-        traces_dir = os.path.join(self.out_dir, "traces")
+    def log_trace(self, task_id: str, trace: Union[SearchTrace, Dict[str, Any]]) -> None:
+        # Save a trace for a specific task as a separate file:
+        # binary .gwtrace for a SearchTrace, indented JSON for a plain dict
+        traces_dir = self.traces_dir
         os.makedirs(traces_dir, exist_ok=True)
+        if isinstance(trace, SearchTrace):
+            trace.save(os.path.join(traces_dir, f"{task_id}.gwtrace"))
+            return
         path = os.path.join(traces_dir, f"{task_id}.json")
         with open(path, "w", encoding="utf-8") as f:
             json.dump(trace, f, indent=2)
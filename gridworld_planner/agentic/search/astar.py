@@ -3,13 +3,22 @@ A* search for Gridworld (unit-cost, 4-neighbor)
 """
 
 import heapq
+from fractions import Fraction
 from typing import Tuple, List, Dict, Optional
 from agentic.env.gridworld import Gridworld
 from agentic.search.heuristics import manhattan, weighted_manhattan
+from agentic.search.bucket_queue import BucketQueue
+from agentic.search.utils import reconstruct_path
 
 
 # A* search for shortest path in grid
-def astar_search(env: Gridworld, heuristic_fn, weight=1.0, max_expansions=200000, timeout_ms=None):
+def astar_search(env: Gridworld, heuristic_fn, weight=1.0, max_expansions=200000, timeout_ms=None, frontier="heap", trace=None):
+    # frontier selects the open-list structure: "heap" (heapq) or "bucket" (integer buckets)
+    # trace is an optional SearchTrace that records every expansion
+    if frontier == "bucket":
+        return _astar_bucket_search(env, heuristic_fn, weight, max_expansions, trace)
+    if frontier != "heap":
+        raise ValueError(f"Unknown frontier: {frontier}")
     # Initialize search structures
     start = env.start
     goal = env.goal
@@ -24,6 +33,9 @@ def astar_search(env: Gridworld, heuristic_fn, weight=1.0, max_expansions=200000
         # Pop node with lowest f = g + h
         _, current = heapq.heappop(frontier)
         nodes_expanded += 1
+        if trace is not None:
+            h = heuristic_fn(current, goal) if weight == 1.0 else weighted_manhattan(current, goal, weight)
+            trace.record(current, cost_so_far[current], h, len(frontier))
         if env.is_goal(current):
             break
         for neighbor in env.neighbors(current):
@@ -55,3 +67,59 @@ def astar_search(env: Gridworld, heuristic_fn, weight=1.0, max_expansions=200000
     path.append(start)
     path.reverse()
     return path, nodes_expanded, max_frontier_size, 'goal_reached'
+
+
+# A* over an integer bucket queue, breaking ties by lower h inside each bucket
+def _astar_bucket_search(env: Gridworld, heuristic_fn, weight=1.0, max_expansions=200000, trace=None):
+    start = env.start
+    goal = env.goal
+    # Scale f = g + w*h to integers: with w = num/den, den*f = den*g + num*h.
+    # w is rounded to the nearest fraction with den <= 1000; keys may be large but
+    # BucketQueue stores only the occupied ones.
+    ratio = Fraction(weight).limit_denominator(1000)
+    num, den = ratio.numerator, ratio.denominator
+    # Buckets need integer keys, so h is always integer Manhattan and the weight
+    # (including any weighted heuristic_fn) is applied only through num/den
+    h_fn = manhattan
+    frontier = BucketQueue()
+    frontier.push(num * h_fn(start, goal), h_fn(start, goal), start)
+    came_from = {start: None}  # track parent links for path
+    cost_so_far = {start: 0}  # g cost for each node
+    closed = set()
+    nodes_expanded = 0
+    max_frontier_size = 1
+
+    while frontier:
+        # Pop node with lowest scaled f, then lowest h
+        _, current = frontier.pop()
+        if current in closed:
+            # Stale entry superseded by a cheaper push
+            continue
+        closed.add(current)
+        nodes_expanded += 1
+        if trace is not None:
+            trace.record(current, cost_so_far[current], weight * h_fn(current, goal), len(frontier))
+        if current == goal:
+            break
+        new_cost = cost_so_far[current] + 1
+        for neighbor in env.neighbors(current):
+            # Only update if new path is better
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                came_from[neighbor] = current
+                closed.discard(neighbor)
+                h = h_fn(neighbor, goal)
+                frontier.push(den * new_cost + num * h, h, neighbor)
+        if len(frontier) > max_frontier_size:
+            max_frontier_size = len(frontier)
+        if nodes_expanded >= max_expansions:
+            # Stop if expansion budget exceeded
+            return None, nodes_expanded, max_frontier_size, 'budget_exceeded'
+    else:
+        # No path found
+        return None, nodes_expanded, max_frontier_size, 'no_path'
+
+    path = reconstruct_path(came_from, start, goal)
+    if path is None:
+        return None, nodes_expanded, max_frontier_size, 'no_path'
+    return path, nodes_expanded, max_frontier_size, 'goal_reached'
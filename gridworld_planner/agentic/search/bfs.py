@@ -8,7 +8,8 @@ from agentic.env.gridworld import Gridworld
 
 
 # Simple BFS for shortest path in grid
-def bfs_search(env: Gridworld, max_expansions=200000):
+def bfs_search(env: Gridworld, max_expansions=200000, trace=None):
+    # trace is an optional SearchTrace that records every expansion (with h = 0)
     # Initialize search structures
     start = env.start
     goal = env.goal
@@ -16,11 +17,14 @@ def bfs_search(env: Gridworld, max_expansions=200000):
     came_from = {start: None}  # track parent links for path
     nodes_expanded = 0
     max_frontier_size = 1
+    depth = {start: 0} if trace is not None else None  # g values, kept only when tracing
 
     while frontier:
         # Pop node from front of queue
         current = frontier.popleft()
         nodes_expanded += 1
+        if trace is not None:
+            trace.record(current, depth[current], 0, len(frontier))
         if env.is_goal(current):
             break
         for neighbor in env.neighbors(current):
@@ -28,6 +32,8 @@ def bfs_search(env: Gridworld, max_expansions=200000):
             if neighbor not in came_from:
                 frontier.append(neighbor)
                 came_from[neighbor] = current
+                if trace is not None:
+                    depth[neighbor] = depth[current] + 1
         max_frontier_size = max(max_frontier_size, len(frontier))
         if nodes_expanded >= max_expansions:
             # Stop if expansion budget exceeded
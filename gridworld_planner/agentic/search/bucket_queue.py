@@ -0,0 +1,50 @@
+"""
+Integer bucket priority queue (Dial's algorithm) for search frontiers.
+"""
+import heapq
+
+
+# Bucket queue for non-negative integer priorities
+class BucketQueue:
+    def __init__(self):
+        # Buckets are stored sparsely: priority -> {tie-break key: stack of items},
+        # plus a min-heap of the occupied priorities. Scaled weighted-A* keys
+        # (den*g + num*h) can be large and spread out, so no dense array is kept.
+        self.buckets = {}
+        self.keys = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, priority, tie, item):
+        # O(1) insert into an existing bucket; a new bucket costs one push onto
+        # the small heap of occupied priorities. Lower tie keys pop first.
+        bucket = self.buckets.get(priority)
+        if bucket is None:
+            self.buckets[priority] = {tie: [item]}
+            heapq.heappush(self.keys, priority)
+        else:
+            stack = bucket.get(tie)
+            if stack is None:
+                bucket[tie] = [item]
+            else:
+                stack.append(item)
+        self.size += 1
+
+    def pop(self):
+        # Return (priority, item) with the lowest priority, then lowest tie key
+        if not self.size:
+            raise IndexError("pop from empty BucketQueue")
+        priority = self.keys[0]
+        bucket = self.buckets[priority]
+        tie = min(bucket) if len(bucket) > 1 else next(iter(bucket))
+        stack = bucket[tie]
+        item = stack.pop()
+        if not stack:
+            del bucket[tie]
+            if not bucket:
+                del self.buckets[priority]
+                heapq.heappop(self.keys)
+        self.size -= 1
+        return priority, item
@@ -0,0 +1,83 @@
+"""
+Fringe search for Gridworld (unit-cost, 4-neighbor).
+Like IDA*, iterates over an f threshold, but keeps the fringe between
+iterations so nodes are not regenerated from the start each time.
+"""
+
+import time
+from agentic.env.gridworld import Gridworld
+from agentic.search.heuristics import weighted_manhattan
+
+
+# Fringe search with a now/later list and a g/parent cache
+def fringe_search(env: Gridworld, heuristic_fn, weight=1.0, max_expansions=200000, timeout_ms=None, max_nodes=None, trace=None):
+    # max_nodes caps the number of cached nodes; the run ends with
+    # 'memory_exceeded' instead of growing past it
+    # trace is an optional SearchTrace that records every expansion
+    start = env.start
+    goal = env.goal
+    t0 = time.time()
+
+    def h(pos):
+        return heuristic_fn(pos, goal) if weight == 1.0 else weighted_manhattan(pos, goal, weight)
+
+    cache = {start: (0, None)}  # g cost and parent for each generated node
+    now = [(start, 0)]  # entries are (node, g); stale entries are skipped lazily
+    later = []
+    flimit = h(start)
+    nodes_expanded = 0
+    max_frontier_size = 1
+    found = False
+
+    while now and not found:
+        fmin = float('inf')
+        while now:
+            node, g = now.pop()
+            if cache[node][0] != g:
+                # A cheaper path to this node was found after it was listed
+                continue
+            f = g + h(node)
+            if f > flimit:
+                # Defer to the next iteration
+                fmin = min(fmin, f)
+                later.append((node, g))
+                continue
+            if env.is_goal(node):
+                found = True
+                break
+            nodes_expanded += 1
+            if trace is not None:
+                trace.record(node, g, f - g, len(now) + len(later))
+            # Push children in reverse so the first neighbor is visited first
+            for neighbor in reversed(env.neighbors(node)):
+                new_cost = g + 1
+                if neighbor in cache and new_cost >= cache[neighbor][0]:
+                    continue
+                cache[neighbor] = (new_cost, node)
+                now.append((neighbor, new_cost))
+            max_frontier_size = max(max_frontier_size, len(now) + len(later))
+            if nodes_expanded >= max_expansions:
+                # Stop if expansion budget exceeded
+                return None, nodes_expanded, max_frontier_size, 'budget_exceeded'
+            if max_nodes is not None and len(cache) > max_nodes:
+                return None, nodes_expanded, max_frontier_size, 'memory_exceeded'
+            if timeout_ms is not None and (nodes_expanded & 1023) == 0 and (time.time() - t0) * 1000 > timeout_ms:
+                return None, nodes_expanded, max_frontier_size, 'timeout'
+        if not found:
+            # Next iteration works through the deferred nodes with a raised limit
+            flimit = fmin
+            later.reverse()
+            now, later = later, []
+
+    if not found:
+        # No path found
+        return None, nodes_expanded, max_frontier_size, 'no_path'
+
+    # Reconstruct path from goal to start
+    path = []
+    node = goal
+    while node is not None:
+        path.append(node)
+        node = cache[node][1]
+    path.reverse()
+    return path, nodes_expanded, max_frontier_size, 'goal_reached'
@@ -0,0 +1,82 @@
+"""
+Iterative-deepening A* (IDA*) for Gridworld (unit-cost, 4-neighbor).
+Memory is bounded by the current path depth instead of the explored area.
+"""
+
+import time
+from agentic.env.gridworld import Gridworld
+from agentic.search.heuristics import weighted_manhattan
+
+
+# IDA* search: repeated depth-first passes with an increasing f bound
+def ida_star_search(env: Gridworld, heuristic_fn, weight=1.0, max_expansions=200000, timeout_ms=None, max_nodes=None, trace=None):
+    # max_nodes caps the depth of the path stack; branches deeper than that are
+    # pruned and the run ends with 'memory_exceeded' if no path fits in the cap
+    # trace is an optional SearchTrace that records every expansion (frontier = path depth)
+    start = env.start
+    goal = env.goal
+    t0 = time.time()
+
+    def h(pos):
+        return heuristic_fn(pos, goal) if weight == 1.0 else weighted_manhattan(pos, goal, weight)
+
+    nodes_expanded = 0
+    max_frontier_size = 1
+    if env.is_goal(start):
+        return [start], 1, 1, 'goal_reached'
+    bound = h(start)
+    memory_capped = False
+    # No simple path costs more than (free cells - 1); once an admissible bound passes
+    # that, the goal is provably unreachable
+    max_cost = None
+    if weight == 1.0:
+        max_cost = env.width * env.height - sum(1 for o in env.obstacles if env.in_bounds(o)) - 1
+
+    while True:
+        # One depth-first pass bounded by f <= bound
+        next_bound = float('inf')
+        path = [start]  # current path, doubles as the DFS stack of nodes
+        on_path = {start}  # avoid cycles along the current path
+        stack = [iter(env.neighbors(start))]
+        nodes_expanded += 1
+        if trace is not None:
+            trace.record(start, 0, h(start), 1)
+        while stack:
+            neighbor = next(stack[-1], None)
+            if neighbor is None:
+                # All children tried, backtrack
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            if neighbor in on_path:
+                continue
+            g = len(path)  # unit cost: depth of the child equals its g
+            f = g + h(neighbor)
+            if f > bound:
+                next_bound = min(next_bound, f)
+                continue
+            if env.is_goal(neighbor):
+                path.append(neighbor)
+                return path, nodes_expanded, max_frontier_size, 'goal_reached'
+            if max_nodes is not None and len(path) >= max_nodes:
+                # Respect the memory cap by pruning instead of growing the stack
+                memory_capped = True
+                continue
+            path.append(neighbor)
+            on_path.add(neighbor)
+            stack.append(iter(env.neighbors(neighbor)))
+            nodes_expanded += 1
+            max_frontier_size = max(max_frontier_size, len(path))
+            if trace is not None:
+                trace.record(neighbor, g, f - g, len(path))
+            if nodes_expanded >= max_expansions:
+                # Stop if expansion budget exceeded
+                return None, nodes_expanded, max_frontier_size, 'budget_exceeded'
+            if timeout_ms is not None and (nodes_expanded & 1023) == 0 and (time.time() - t0) * 1000 > timeout_ms:
+                return None, nodes_expanded, max_frontier_size, 'timeout'
+        if next_bound == float('inf'):
+            # Nothing left beyond the bound: either unreachable or cut off by the cap
+            return None, nodes_expanded, max_frontier_size, 'memory_exceeded' if memory_capped else 'no_path'
+        if max_cost is not None and next_bound > max_cost and not memory_capped:
+            return None, nodes_expanded, max_frontier_size, 'no_path'
+        bound = next_bound
@@ -0,0 +1,102 @@
+"""
+Compact search-trace recording and replay.
+Expansions are stored in preallocated typed arrays used as a ring buffer,
+and saved in a small binary format (fixed header + raw little-endian arrays).
+"""
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+TRACE_MAGIC = b"GWTR"
+TRACE_VERSION = 1
+# magic, version, capacity, stored steps, total expansions recorded
+_HEADER = struct.Struct("<4sHIIQ")
+# (field name, array typecode) in file order
+_FIELDS = (("xs", "i"), ("ys", "i"), ("gs", "i"), ("hs", "d"), ("frontier_sizes", "i"))
+
+TraceStep = namedtuple("TraceStep", ["step", "node", "g", "h", "frontier_size"])
+
+
+# Ring buffer of expansions: node, g, h and frontier size per step
+class SearchTrace:
+    def __init__(self, capacity=1 << 20):
+        # Preallocate every array once so recording never allocates
+        self.capacity = capacity
+        self.count = 0  # total expansions recorded, including overwritten ones
+        for name, typecode in _FIELDS:
+            setattr(self, name, array(typecode, bytes(array(typecode).itemsize * capacity)))
+
+    def record(self, node, g, h, frontier_size):
+        # Record one expansion, overwriting the oldest step once the buffer is full
+        i = self.count % self.capacity
+        self.xs[i] = node[0]
+        self.ys[i] = node[1]
+        self.gs[i] = g
+        self.hs[i] = h
+        self.frontier_sizes[i] = frontier_size
+        self.count += 1
+
+    def __len__(self):
+        # Number of steps currently held (at most capacity)
+        return min(self.count, self.capacity)
+
+    def _ordered(self, values):
+        # Return a field's stored values in expansion order
+        n = len(self)
+        if self.count <= self.capacity:
+            return values[:n]
+        i = self.count % self.capacity
+        return values[i:] + values[:i]
+
+    def __iter__(self):
+        # Replay the stored steps in expansion order
+        first = self.count - len(self)
+        columns = [self._ordered(getattr(self, name)) for name, _ in _FIELDS]
+        for k, (x, y, g, h, f) in enumerate(zip(*columns)):
+            yield TraceStep(first + k, (x, y), g, h, f)
+
+    def expansion_order(self):
+        # List of expanded nodes, oldest first
+        return list(zip(self._ordered(self.xs), self._ordered(self.ys)))
+
+    def summary(self):
+        # Aggregate stats over the stored steps
+        frontier = self._ordered(self.frontier_sizes)
+        gs = self._ordered(self.gs)
+        return {
+            "expansions": self.count,
+            "stored_steps": len(self),
+            "truncated": self.count > self.capacity,
+            "max_frontier_size": max(frontier) if frontier else 0,
+            "max_g": max(gs) if gs else 0,
+        }
+
+    def save(self, path):
+        # Write the trace in expansion order as header + raw arrays
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, self.capacity, len(self), self.count))
+            for name, _ in _FIELDS:
+                values = self._ordered(getattr(self, name))
+                if sys.byteorder == "big":
+                    values.byteswap()
+                f.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        # Read a trace written by save(); the buffer is sized to the stored steps
+        with open(path, "rb") as f:
+            magic, version, _, n, count = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != TRACE_MAGIC or version != TRACE_VERSION:
+                raise ValueError(f"Not a search trace file: {path}")
+            trace = cls(max(n, 1))
+            trace.count = count
+            # Rotate so the ring buffer's oldest slot lines up with count % capacity
+            shift = n - count % n if count > n else 0
+            for name, typecode in _FIELDS:
+                values = array(typecode)
+                values.frombytes(f.read(values.itemsize * n))
+                if sys.byteorder == "big":
+                    values.byteswap()
+                getattr(trace, name)[:n] = values[shift:] + values[:shift]
+        return trace
@@ -0,0 +1,74 @@
+"""
+Vectorized wavefront (BFS) over a stack of same-sized grids.
+All grids in an (N, height, width) occupancy tensor are expanded at once.
+"""
+import numpy as np
+
+# Moves in the same order as Gridworld.neighbors: left, right, up, down
+MOVES = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int64)
+
+
+def batched_wavefront(free, goals, starts=None):
+    # free: bool array (N, height, width), True where passable, indexed [n, y, x].
+    # goals/starts: int arrays (N, 2) of (x, y). Returns goal distances (-1 if
+    # unreachable) and the largest wavefront seen per grid. When starts are given,
+    # expansion stops once every start has been reached.
+    n, height, width = free.shape
+    idx = np.arange(n)
+    # Pad by one cell so shifted neighbors never leave the array
+    passable = np.zeros((n, height + 2, width + 2), dtype=bool)
+    passable[:, 1:-1, 1:-1] = free
+    dist = np.full(passable.shape, -1, dtype=np.int32)
+    frontier = np.zeros_like(passable)
+    frontier[idx, goals[:, 1] + 1, goals[:, 0] + 1] = True
+    frontier &= passable
+    np.copyto(dist, 0, where=frontier)
+    unvisited = passable & ~frontier
+    max_frontier = frontier.sum(axis=(1, 2))
+    grown = np.empty_like(frontier)
+    d = 0
+    while frontier.any():
+        if starts is not None and (dist[idx, starts[:, 1] + 1, starts[:, 0] + 1] >= 0).all():
+            break
+        d += 1
+        # Grow the wavefront one step in all four directions, into unvisited free cells
+        grown.fill(False)
+        grown[:, 1:, :] |= frontier[:, :-1, :]
+        grown[:, :-1, :] |= frontier[:, 1:, :]
+        grown[:, :, 1:] |= frontier[:, :, :-1]
+        grown[:, :, :-1] |= frontier[:, :, 1:]
+        grown &= unvisited
+        unvisited ^= grown
+        frontier, grown = grown, frontier
+        np.copyto(dist, d, where=frontier)
+        np.maximum(max_frontier, frontier.sum(axis=(1, 2)), out=max_frontier)
+    return dist[:, 1:-1, 1:-1], max_frontier
+
+
+def batched_paths(dist, starts):
+    # Follow decreasing distances from each start to its goal.
+    # Returns (costs, paths) with cost -1 and path None where unreachable.
+    n, height, width = dist.shape
+    idx = np.arange(n)
+    padded = np.full((n, height + 2, width + 2), -1, dtype=np.int32)
+    padded[:, 1:-1, 1:-1] = dist
+    costs = dist[idx, starts[:, 1], starts[:, 0]]
+    steps = int(costs.max()) if n else 0
+    trajectory = np.empty((max(steps, 0) + 1, n, 2), dtype=np.int64)
+    trajectory[0] = starts
+    cur = starts.astype(np.int64)
+    cur_d = costs.astype(np.int64)
+    for k in range(1, steps + 1):
+        # Pick the first neighbor one step closer to the goal
+        cand = cur[:, None, :] + MOVES[None, :, :]
+        cand_d = padded[idx[:, None], cand[..., 1] + 1, cand[..., 0] + 1]
+        choice = (cand_d == (cur_d - 1)[:, None]).argmax(axis=1)
+        active = cur_d > 0
+        cur = np.where(active[:, None], cand[idx, choice], cur)
+        cur_d = np.where(active, cur_d - 1, cur_d)
+        trajectory[k] = cur
+    paths = []
+    for i in range(n):
+        c = int(costs[i])
+        paths.append([tuple(p) for p in trajectory[:c + 1, i].tolist()] if c >= 0 else None)
+    return costs, paths
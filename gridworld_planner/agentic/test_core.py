@@ -37,3 +37,331 @@ def test_obstacle_generation():
     obs = generate_obstacles(5, 5, 0.2, 42, (0, 0), (4, 4))
     assert all(o != (0, 0) and o != (4, 4) for o in obs)
     assert len(obs) <= 25 * 0.2 + 1
+
+def test_sweep_groups_share_map_and_match_runner(tmp_path):
+    # Test that a sweep spec expands to per-map groups and matches the per-task runner
+    from agentic.eval.sweep import expand_sweep, schedule_groups, run_group, load_sweep_spec
+    from agentic.eval.runner import run_task_from_dict
+    import json
+    spec = {
+        "grid_sizes": [6, 10],
+        "densities": [0.2],
+        "seeds": [7],
+        "planners": [
+            {"algorithm": "bfs"},
+            {"algorithm": "astar", "heuristic": "weighted", "weight": 2.0},
+        ],
+    }
+    spec_path = tmp_path / "sweep.json"
+    spec_path.write_text(json.dumps(spec))
+    groups = expand_sweep(load_sweep_spec(str(spec_path)))
+    assert len(groups) == 2 and all(len(g["tasks"]) == 2 for g in groups)
+    ordered = schedule_groups(groups)
+    assert ordered[0]["width"] == 10
+    results = run_group(ordered[0])
+    assert results[0]["task_id"] == "gw_000002"
+    # Planner keys beyond the defaults reach the expanded tasks
+    extra = dict(spec, planners=[{"algorithm": "astar", "frontier": "bucket"}, {"algorithm": "ida_star", "max_nodes": 50}])
+    planners = [t["planner"] for t in expand_sweep(extra)[0]["tasks"]]
+    assert planners[0]["frontier"] == "bucket" and planners[1]["max_nodes"] == 50
+    assert planners[0]["max_expansions"] == 200000 and planners[1]["heuristic"] == "manhattan"
+    for task, result in zip(ordered[0]["tasks"], results):
+        expected = run_task_from_dict(task)
+        assert result["path_cost"] == expected["path_cost"]
+        assert result["optimal_cost"] == expected["optimal_cost"]
+
+def test_memory_bounded_planners_match_bfs():
+    # Test that IDA* and fringe search find optimal paths and respect the memory cap
+    from agentic.search.ida import ida_star_search
+    from agentic.search.fringe import fringe_search
+    from agentic.eval.runner import run_task_from_dict
+    for seed in range(5):
+        obs = generate_obstacles(8, 8, 0.25, seed, (0, 0), (7, 7))
+        env = Gridworld(8, 8, obs, (0, 0), (7, 7))
+        path_b, _, _, reason_b = bfs_search(env)
+        for search_fn in (ida_star_search, fringe_search):
+            path, _, _, reason = search_fn(env, manhattan, max_expansions=20000)
+            if path_b is None and search_fn is ida_star_search:
+                # IDA* cannot always prove unreachability cheaply; it may run out of budget instead
+                assert path is None and reason in ('no_path', 'budget_exceeded')
+                continue
+            assert reason == reason_b
+            if path_b is not None:
+                assert path[0] == (0, 0) and path[-1] == (7, 7)
+                assert len(path) == len(path_b)
+    env = Gridworld(10, 10, [], (0, 0), (9, 9))
+    assert ida_star_search(env, manhattan, max_nodes=5)[3] == 'memory_exceeded'
+    assert fringe_search(env, manhattan, max_nodes=5)[3] == 'memory_exceeded'
+    task = {
+        "grid": {"width": 6, "height": 6, "obstacles": [], "start": [0, 0], "goal": [5, 5]},
+        "planner": {"algorithm": "fringe", "heuristic": "manhattan"},
+        "eval": {"measure_memory": True},
+    }
+    result = run_task_from_dict(task)
+    assert result["path_cost"] == 10 and result["peak_memory_kb"] is not None
+    # A caller's own tracing survives a measured run
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        run_task_from_dict(task)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    # An enclosed start region is proven unreachable by IDA*
+    walled = Gridworld(6, 6, [(2, 0), (2, 1), (0, 2), (1, 2), (2, 2)], (0, 0), (5, 5))
+    assert ida_star_search(walled, manhattan)[3] == 'no_path'
+
+def test_bucket_frontier_astar():
+    # Test that the bucket-queue frontier orders by priority then tie key, and A* on it stays optimal
+    from agentic.search.bucket_queue import BucketQueue
+    q = BucketQueue()
+    for priority, tie, item in [(5, 2, "a"), (3, 1, "b"), (5, 0, "c"), (1, 4, "d")]:
+        q.push(priority, tie, item)
+    assert [q.pop()[1] for _ in range(4)] == ["d", "b", "c", "a"]
+    # Storage is sparse: widely spread keys (as from den*g + num*h) only cost occupied buckets
+    q.push(10 ** 9, 0, "far")
+    q.push(7, 0, "near")
+    assert len(q.buckets) == 2 and q.pop() == (7, "near") and q.pop() == (10 ** 9, "far")
+    obs = generate_obstacles(60, 60, 0.2, 3, (0, 0), (59, 59))
+    env = Gridworld(60, 60, obs, (0, 0), (59, 59))
+    path_opt, *_ = bfs_search(env)
+    for weight in (1.37, 1.2345):
+        path_w, _, _, reason = astar_search(env, manhattan, weight=weight, frontier="bucket")
+        assert reason == "goal_reached"
+        assert len(path_opt) - 1 <= len(path_w) - 1 <= weight * (len(path_opt) - 1)
+    for seed in range(5):
+        obs = generate_obstacles(12, 12, 0.25, seed, (0, 0), (11, 11))
+        env = Gridworld(12, 12, obs, (0, 0), (11, 11))
+        path_h, _, _, reason_h = astar_search(env, manhattan)
+        path_b, _, _, reason_b = astar_search(env, manhattan, frontier="bucket")
+        assert reason_h == reason_b
+        if path_h is not None:
+            assert len(path_h) == len(path_b)
+            path_w, *_ = astar_search(env, manhattan, weight=1.5, frontier="bucket")
+            assert path_w[0] == (0, 0) and path_w[-1] == (11, 11)
+    # The weighted heuristic at weight 1.0 returns floats; the bucket frontier must still work
+    from agentic.eval.runner import run_task_from_dict
+    task = {
+        "grid": {"width": 6, "height": 6, "obstacles": [], "start": [0, 0], "goal": [5, 5]},
+        "planner": {"algorithm": "astar", "heuristic": "weighted", "weight": 1.0, "frontier": "bucket"},
+    }
+    assert run_task_from_dict(task)["path_cost"] == 10
+
+def test_result_cache_hits_and_config_mismatch(tmp_path, monkeypatch):
+    # Test that repeated tasks hit the cache, mismatched configs miss, and SQLite persists results
+    import agentic.cache as cache_module
+    from agentic.cache import ResultCache, run_task_cached
+    task = {
+        "task_id": "a",
+        "grid": {"width": 6, "height": 6, "obstacles": [[2, 2], [1, 3]], "start": [0, 0], "goal": [5, 5]},
+        "planner": {"algorithm": "astar", "heuristic": "manhattan", "weight": 1},
+    }
+    db_path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(sqlite_path=db_path)
+    first = run_task_cached(task, cache)
+    assert first["cached"] is False
+    # Same task with reordered obstacles, explicit defaults and a new id is a hit
+    resent = dict(task, task_id="b", grid=dict(task["grid"], obstacles=[[1, 3], [2, 2]]),
+                  planner={"algorithm": "astar", "weight": 1.0, "max_expansions": 200000})
+    second = run_task_cached(resent, cache)
+    assert second["cached"] is True and second["task_id"] == "b"
+    assert second["path_cost"] == first["path_cost"]
+    other = dict(task, planner={"algorithm": "bfs"})
+    assert cache.get(other) is None
+    cache.close()
+    reopened = ResultCache(sqlite_path=db_path)
+    assert reopened.get(task)["cached"] is True
+    reopened.close()
+    expired = ResultCache(ttl_s=0.0, sqlite_path=db_path)
+    assert expired.get(task) is None
+    expired.close()
+    # MCTS, traced and timed-out runs are never stored
+    fresh = ResultCache()
+    mcts_task = dict(task, planner={"algorithm": "mcts", "timeout_ms": 200})
+    traced = dict(task, eval={"record_trace": True, "trace_dir": str(tmp_path)})
+    for uncacheable in (mcts_task, traced):
+        run_task_cached(uncacheable, fresh)
+        assert run_task_cached(uncacheable, fresh)["cached"] is False
+    assert len(fresh) == 0
+    timed_out = dict(first, termination_reason="timeout")
+    monkeypatch.setattr(cache_module, "run_task_from_dict", lambda t: dict(timed_out))
+    run_task_cached(task, fresh)
+    assert len(fresh) == 0
+    fresh.close()
+    # The SQLite backend is pruned on put: expired rows and rows over the caps are deleted
+    import sqlite3
+    pruned = ResultCache(max_entries=1, sqlite_path=db_path)
+    pruned.put(other, first)
+    db = sqlite3.connect(db_path)
+    assert db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 1
+    pruned.ttl_s = -1.0
+    pruned.put(task, first)
+    assert db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+    tiny = ResultCache(max_bytes=10, sqlite_path=db_path)
+    tiny.put(task, first)
+    assert db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+    tiny.close()
+    db.close()
+    pruned.close()
+    small = ResultCache(max_entries=1)
+    small.put(task, first)
+    small.put(other, first)
+    assert len(small) == 1 and small.get(task) is None
+    small.close()
+
+def test_search_trace_record_save_and_replay(tmp_path):
+    # Test that traces record expansions, wrap as a ring buffer, and round-trip through the binary format
+    from agentic.search.trace import SearchTrace
+    from agentic.eval.runner import run_task_from_dict
+    env = Gridworld(6, 6, [(2, 2)], (0, 0), (5, 5))
+    trace = SearchTrace(capacity=1000)
+    path, nodes_expanded, _, _ = astar_search(env, manhattan, trace=trace)
+    assert trace.count == nodes_expanded
+    steps = list(trace)
+    assert steps[0].node == (0, 0) and steps[0].g == 0 and steps[0].h == 10
+    assert steps[-1].node == (5, 5) and steps[-1].g == len(path) - 1
+    ring = SearchTrace(capacity=4)
+    bfs_search(env, trace=ring)
+    assert len(ring) == 4 and ring.summary()["truncated"]
+    trace_path = str(tmp_path / "bfs.gwtrace")
+    ring.save(trace_path)
+    loaded = SearchTrace.load(trace_path)
+    assert list(loaded) == list(ring)
+    task = {
+        "task_id": "traced",
+        "grid": {"width": 6, "height": 6, "obstacles": [[2, 2]], "start": [0, 0], "goal": [5, 5]},
+        "planner": {"algorithm": "fringe"},
+        "eval": {"record_trace": True, "trace_dir": str(tmp_path)},
+    }
+    result = run_task_from_dict(task)
+    assert SearchTrace.load(result["trace_path"]).count == result["nodes_expanded"]
+    # Id-less tasks do not overwrite each other's trace files
+    anonymous = dict(task, task_id="")
+    paths = {run_task_from_dict(anonymous)["trace_path"] for _ in range(2)}
+    assert len(paths) == 2
+    # Programmatic callers can pass their own trace instead of a trace_dir
+    own = SearchTrace(capacity=100)
+    result = run_task_from_dict(dict(task, eval={"record_trace": True}), trace=own)
+    assert own.count == result["nodes_expanded"] and result["trace_path"] is None
+    with pytest.raises(ValueError):
+        run_task_from_dict(dict(task, eval={"record_trace": True}))
+
+def test_batched_wavefront_matches_bfs():
+    # Test that the batched engine returns BFS-optimal costs and valid paths for stacked grids
+    from agentic.eval.batched import run_tasks_batched
+    tasks = []
+    for seed in range(12):
+        size = 8 if seed % 2 else 11
+        obs = generate_obstacles(size, size, 0.3, seed, (0, 0), (size - 1, size - 1))
+        tasks.append({
+            "task_id": f"t{seed}",
+            "grid": {"width": size, "height": size, "obstacles": obs, "start": [0, 0], "goal": [size - 1, size - 1]},
+            "planner": {"algorithm": "bfs"},
+        })
+    results, paths = run_tasks_batched(tasks, batch_size=4)
+    for task, result, path in zip(tasks, results, paths):
+        grid = task["grid"]
+        env = Gridworld(grid["width"], grid["height"], grid["obstacles"], (0, 0), tuple(grid["goal"]))
+        path_b, *_ = bfs_search(env)
+        assert result["task_id"] == task["task_id"]
+        assert result["path_cost"] == (len(path_b) - 1 if path_b else None)
+        if path is not None:
+            assert path[0] == env.start and path[-1] == env.goal
+            assert all(b in env.neighbors(a) for a, b in zip(path, path[1:]))
+
+def test_work_queue_workers_and_lease_reclaim(tmp_path):
+    # Test that several worker processes drain one queue file, expired leases are reclaimed,
+    # and every task gets exactly one result
+    import multiprocessing
+    from agentic.eval.work_queue import WorkQueue, run_worker
+    spec = {
+        "grid_sizes": [6, 8],
+        "densities": [0.1, 0.2],
+        "seeds": [1, 2],
+        "planners": [{"algorithm": "bfs"}, {"algorithm": "astar", "heuristic": "weighted", "weight": 1.5}],
+    }
+    queue_path = str(tmp_path / "queue.sqlite")
+    queue = WorkQueue(queue_path)
+    assert queue.enqueue_sweep(spec) == 8
+    assert queue.enqueue_sweep(spec) == 0
+    # A worker that claims an item and crashes leaves an already-expired lease behind
+    item_id, _ = queue.claim("crashed", lease_s=-1.0)
+    assert queue.progress()["items_expired"] == 1
+    workers = [multiprocessing.Process(target=run_worker, args=(queue_path, f"w{i}"), kwargs={"poll_s": 0.05})
+               for i in range(3)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=60)
+        assert w.exitcode == 0
+    status = queue.progress()
+    assert status["items_done"] == 8 and status["tasks_done"] == status["tasks_total"] == 16
+    assert "crashed" not in status["tasks_by_worker"]
+    assert len({r["task_id"] for r in queue.results()}) == 16
+    assert queue.renew(item_id, "crashed") is False
+    queue.close()
+
+def test_sweep_runs_oracle_once_per_unreachable_map(monkeypatch):
+    # Test that the oracle runs once per map group even when it finds no path
+    import agentic.eval.sweep as sweep
+    calls = []
+    real_oracle = sweep.oracle_optimal_cost
+    monkeypatch.setattr(sweep, "oracle_optimal_cost", lambda env, n: calls.append(1) or real_oracle(env, n))
+    spec = {
+        "grid_sizes": [8],
+        "densities": [0.5],
+        "seeds": [1, 2, 3],
+        "planners": [{"algorithm": "astar"}, {"algorithm": "astar", "heuristic": "weighted", "weight": 2.0}],
+        "eval": {"compute_oracle_optimal": True},
+    }
+    results = sweep.run_sweep(spec)
+    assert len(results) == 6 and len(calls) == 3
+
+def test_work_queue_sweeps_heartbeat_and_failures(tmp_path, monkeypatch):
+    # Test that different sweeps share a queue without colliding, leases are renewed
+    # while a slow group runs, and a failing group is marked failed after max_attempts
+    import os
+    import threading
+    import time
+    import agentic.eval.work_queue as wq
+    queue_path = str(tmp_path / "queue.sqlite")
+    queue = wq.WorkQueue(queue_path)
+    base = {"densities": [0.0], "seeds": [1]}
+    sweep_a = dict(base, grid_sizes=[6], planners=[{"algorithm": "bfs"}])
+    sweep_b = dict(base, grid_sizes=[6], planners=[{"algorithm": "fringe"}])
+    sweep_c = dict(base, grid_sizes=[8], planners=[{"algorithm": "bfs"}])
+    assert [queue.enqueue_sweep(s) for s in (sweep_a, sweep_b, sweep_c)] == [1, 1, 1]
+    real_run_group = wq.run_group
+
+    def slow_run_group(group):
+        time.sleep(0.5)
+        return real_run_group(group)
+
+    monkeypatch.setattr(wq, "run_group", slow_run_group)
+    workers = [threading.Thread(target=wq.run_worker, args=(queue_path, f"w{i}"),
+                                kwargs={"lease_s": 0.2, "poll_s": 0.05}) for i in range(2)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=30)
+    assert len(queue.results()) == 3
+    # The heartbeat kept every lease alive, so no group was claimed twice
+    assert queue.db.execute("SELECT MAX(attempts) FROM items").fetchone()[0] == 1
+    monkeypatch.setattr(wq, "run_group", real_run_group)
+    queue.enqueue_sweep(dict(base, grid_sizes=[5], planners=[{"algorithm": "unknown"}]))
+    wq.run_worker(queue_path, "w0", poll_s=0.01, max_attempts=2)
+    failures = queue.failures()
+    assert len(failures) == 1 and failures[0][1] == 2 and "ValueError" in failures[0][2]
+    assert queue.progress()["items_failed"] == 1
+    # Traced sweeps run through the queue, with one trace file per task in trace_dir
+    trace_dir = tmp_path / "traces"
+    traced = dict(base, grid_sizes=[7], planners=[{"algorithm": "bfs"}, {"algorithm": "astar"}],
+                  eval={"record_trace": True, "trace_dir": str(trace_dir)})
+    queue.enqueue_sweep(traced)
+    wq.run_worker(queue_path, "w0", poll_s=0.01)
+    assert queue.progress()["items_failed"] == 1
+    traced_results = [r for r in queue.results() if r.get("trace_path")]
+    assert len(traced_results) == 2
+    assert all(os.path.dirname(r["trace_path"]) == str(trace_dir) and os.path.exists(r["trace_path"])
+               for r in traced_results)
+    queue.close()
@@ -3,14 +3,17 @@ LangChain tool wrapper for Gridworld planning agent.
 Wraps the core runner as a LangChain tool for evaluation harness.
 """
 from langchain_core.tools import tool
-from agentic.eval.runner import run_task_from_dict
+from agentic.cache import ResultCache, run_task_cached
+
+# Shared result cache, since agents often resend the same TaskSpec
+result_cache = ResultCache()
 
 @tool
 def solve_gridworld_task(task_json: dict) -> dict:
     """
     Solve a Gridworld planning task using the specified algorithm/heuristic.
     Input: TaskSpec dict
-    Output: RunResult dict
+    Output: RunResult dict (cached=True if served from the result cache)
     """
-    # Call the core runner to solve the task and return the result
-    return run_task_from_dict(task_json)
+    # Call the core runner to solve the task, reusing cached results for repeated tasks
+    return run_task_cached(task_json, result_cache)